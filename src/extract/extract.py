@@ -1,24 +1,85 @@
 import os
-import zlib
+import re
+import sys
 import bz2
-import json
+import hashlib
+import mmap
+import shutil
 import struct
-from typing import List, Dict, Tuple, Union
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import List, Dict, Tuple, Union, Iterator, Iterable, Callable
 from PIL import Image
 from io import BytesIO
 import lzma
+import zstandard as zstd
+import msgpack
 from pydub import AudioSegment
 
+# zlib-ng is a drop-in, SIMD-accelerated build of zlib producing the same DEFLATE stream
+try:
+    from zlib_ng import zlib_ng as zlib
+except ImportError:
+    import zlib
+
+# Archive signature followed by a format-version byte; version 1 archives
+# had no signature and a JSON metadata header
+DHC_MAGIC = b'DHC'
+FORMAT_VERSION = 4
+
+# Layout byte following the version: a single file's data runs from the header to EOF,
+# a folder archive has an index, name pool and data pool
+LAYOUT_FILE = 0
+LAYOUT_FOLDER = 1
+
+# Number of leading bytes inspected to pick an algorithm
+SIGNATURE_SIZE = 16
+
+# Signatures of already-encoded inputs, keyed by the algorithm that stores them verbatim.
+# Both data type detection and the passthrough checks are built from this table.
+PASSTHROUGH_SIGNATURES = {
+    'jpeg': rb'\xFF\xD8\xFF',
+    'png': rb'\x89PNG\r\n\x1A\n',
+    'webp': rb'RIFF....WEBP',
+    'mp3': rb'ID3|\xFF\xFB',
+    'flac': rb'fLaC',
+    'aac': rb'ADIF|\xFF[\xF0\xF1\xF8\xF9]'  # ADTS sync word
+}
+
+# Size of the slices fed to the incremental compressors
+CHUNK_SIZE = 64 * 1024
+
+# Archive files are read and written through a large buffer to keep syscalls per entry low
+IO_BUFFER_SIZE = 1 << 20
+
+# Length prefix of the metadata header
+_LENGTH = struct.Struct('<I')
+
+# Folder archive index entry: (name offset, name length, data offset, data length).
+# A folder archive is laid out as header, index, name pool, data pool.
+_INDEX_ENTRY = struct.Struct('<QQQQ')
+
+# Zero-copy splicing of worker output into the archive; sendfile only accepts regular
+# file descriptors as the destination on Linux
+_USE_SENDFILE = hasattr(os, 'sendfile') and sys.platform.startswith('linux')
+
 class DHC:
-    def __init__(self):
+    def __init__(self, lzma_preset: int = 3, zstd_threads: int = -1):
+        # Presets above 3 cost much more time for a small gain in ratio
+        self.lzma_preset = lzma_preset
+        # -1 lets zstd use one thread per core, 0 compresses on the calling thread only
+        self.zstd_threads = zstd_threads
         # Supported algorithms and corresponding compression methods
         self.algorithms = {
-            'text': ['lz77', 'lz78', 'lzma'],
+            'text': ['zstd', 'lz77', 'lz78', 'lzma'],
             'image': ['jpeg', 'png', 'webp'],
             'audio': ['mp3', 'flac', 'aac']
         }
         # Mapping compression and decompression methods
         self.compression_methods = {
+            'zstd': self._compress_zstd,
             'lz77': self._compress_lz77,
             'lz78': self._compress_lz78,
             'lzma': self._compress_lzma,
@@ -30,6 +91,7 @@ class DHC:
             'aac': self._compress_aac
         }
         self.decompression_methods = {
+            'zstd': self._decompress_zstd,
             'lz77': self._decompress_lz77,
             'lz78': self._decompress_lz78,
             'lzma': self._decompress_lzma,
@@ -40,6 +102,31 @@ class DHC:
             'flac': self._decompress_flac,
             'aac': self._decompress_aac
         }
+        # Shared zstd context, so its tables and buffers are allocated once per instance
+        # rather than once per file. It must not be used from two threads at once.
+        # Frames carry an xxhash64 checksum, as .dhc has no integrity check of its own.
+        self._zstd_compressor = zstd.ZstdCompressor(level=3, threads=zstd_threads, write_checksum=True)
+        # Incremental compressors for the algorithms that can be fed chunk by chunk. They are the
+        # single source for these codecs: the streaming paths and the _compress_* methods both build
+        # on them, so a subclass changes a text codec by replacing its entry here.
+        self.stream_compressors = {
+            'zstd': lambda size: self._zstd_compressor.compressobj(size=size),
+            'lz77': lambda size: zlib.compressobj(6),
+            'lz78': lambda size: bz2.BZ2Compressor(),
+            # .dhc has no checksum of its own, so keep xz's check; CRC32 is cheaper than the default CRC64
+            'lzma': lambda size: lzma.LZMACompressor(preset=self.lzma_preset, check=lzma.CHECK_CRC32)
+        }
+        # File signatures, one named group per data type, matched in a single pass
+        self._magic_re = re.compile(
+            b'(?P<image>%s)|(?P<audio>%s)' % (PASSTHROUGH_SIGNATURES['jpeg'], PASSTHROUGH_SIGNATURES['mp3']),
+            re.DOTALL
+        )
+        # Inputs the matching algorithm stores verbatim, one named group per algorithm
+        self._passthrough_re = re.compile(
+            b'|'.join(b'(?P<%s>%s)' % (algorithm.encode(), signature)
+                      for algorithm, signature in PASSTHROUGH_SIGNATURES.items()),
+            re.DOTALL
+        )
 
     def compress(self, input_path: str, output_path: str) -> None:
         """
@@ -59,91 +146,202 @@ class DHC:
         self._decompress_file(input_path, output_path)
 
     def _compress_file(self, input_path: str, output_path: str) -> None:
-        with open(input_path, 'rb') as f:
-            data = f.read()
-
-        data_type = self._analyze_data(data)
-        best_algorithm = self._select_best_algorithm(data_type)
-        compressed_data, metadata = self.compression_methods[best_algorithm](data)
+        header = _read_signature(input_path)
+        best_algorithm, compression_method = self._select_compressor(header)
+        if self._is_passthrough(best_algorithm, header):
+            # Stored verbatim, so the input is spliced into the output without being read here
+            with open(output_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+                metadata = {'algorithm': best_algorithm, 'passthrough': True}
+                self._write_header(f, LAYOUT_FILE, {os.path.basename(input_path): metadata})
+                _copy_into(input_path, f)
+            return
 
-        with open(output_path, 'wb') as f:
-            metadata_json = json.dumps(metadata).encode('utf-8')
-            f.write(struct.pack('I', len(metadata_json)))
-            f.write(metadata_json)
-            f.write(compressed_data)
+        with _map_file(input_path) as data:
+            chunks, metadata = self._compress_stream(best_algorithm, compression_method, data)
+            with open(output_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+                self._write_header(f, LAYOUT_FILE, {os.path.basename(input_path): metadata})
+                for chunk in chunks:
+                    f.write(chunk)
 
     def _compress_folder(self, folder_path: str, output_path: str) -> None:
-        compressed_files = {}
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                with open(file_path, 'rb') as f:
-                    data = f.read()
-                data_type = self._analyze_data(data)
-                best_algorithm = self._select_best_algorithm(data_type)
-                compressed_data, metadata = self.compression_methods[best_algorithm](data)
-                relative_path = os.path.relpath(file_path, folder_path)
-                compressed_files[relative_path] = (compressed_data, metadata)
-
-        with open(output_path, 'wb') as f:
-            metadata_json = json.dumps({k: v[1] for k, v in compressed_files.items()}).encode('utf-8')
-            f.write(struct.pack('I', len(metadata_json)))
-            f.write(metadata_json)
-            for file_path, (compressed_data, _) in compressed_files.items():
-                f.write(struct.pack('I', len(file_path)))
-                f.write(file_path.encode('utf-8'))
-                f.write(struct.pack('I', len(compressed_data)))
-                f.write(compressed_data)
+        entries = list(_scan_files(folder_path))
+        sizes = [entry.stat().st_size for entry in entries]
+        size_counts = Counter(sizes)
+
+        # Identical files are compressed once; later copies only reference the first one.
+        # Only files sharing a size can be identical, so only those get hashed.
+        file_paths = []
+        relative_paths = []
+        duplicates = {}
+        seen = {}
+        for entry, size in zip(entries, sizes):
+            relative_path = os.path.relpath(entry.path, folder_path)
+            if size_counts[size] > 1:
+                digest = _hash_file(entry.path)
+                if digest in seen:
+                    duplicates[relative_path] = {'ref': seen[digest]}
+                    continue
+                seen[digest] = relative_path
+            file_paths.append(entry.path)
+            relative_paths.append(relative_path)
+
+        # Every file is an independent CPU-bound job, so spread them over all cores.
+        # Workers return a file holding each entry's data, which is spliced in below.
+        with tempfile.TemporaryDirectory() as temp_dir:
+            records = {}
+            # Workers are built from this instance's class and algorithm table, so subclasses and
+            # changes to self.algorithms apply to folder compression as well
+            with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker,
+                                     initargs=(type(self), self.algorithms, self.lzma_preset)) as executor:
+                for relative_path, data_path, metadata in executor.map(
+                        _compress_one, file_paths, relative_paths, [temp_dir] * len(file_paths), chunksize=8):
+                    records[relative_path] = (data_path, metadata)
+
+            with open(output_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+                metadata = {k: v[1] for k, v in records.items()}
+                metadata.update(duplicates)
+                self._write_header(f, LAYOUT_FOLDER, metadata)
+
+                names = [relative_path.encode('utf-8') for relative_path in records]
+                data_sizes = [os.path.getsize(data_path) for data_path, _ in records.values()]
+                name_offset = f.tell() + _INDEX_ENTRY.size * len(names)
+                data_offset = name_offset + sum(len(name) for name in names)
+                index = bytearray()
+                for name, data_size in zip(names, data_sizes):
+                    index += _INDEX_ENTRY.pack(name_offset, len(name), data_offset, data_size)
+                    name_offset += len(name)
+                    data_offset += data_size
+
+                f.write(index)
+                f.write(b''.join(names))
+                for (data_path, _), data_size in zip(records.values(), data_sizes):
+                    # The index already points past this entry, so a changed size corrupts the archive
+                    if _copy_into(data_path, f) != data_size:
+                        raise RuntimeError(f"{data_path} changed size while it was being archived.")
 
     def _decompress_file(self, input_path: str, output_path: str) -> None:
         with open(input_path, 'rb') as f:
-            metadata_len = struct.unpack('I', f.read(4))[0]
-            metadata_json = f.read(metadata_len)
-            metadata = json.loads(metadata_json.decode('utf-8'))
-
-            for file_path, meta in metadata.items():
-                file_len = struct.unpack('I', f.read(4))[0]
-                file_path = f.read(file_len).decode('utf-8')
-                compressed_data_len = struct.unpack('I', f.read(4))[0]
-                compressed_data = f.read(compressed_data_len)
+            layout, metadata = self._read_header(f)
+            references = {k: meta['ref'] for k, meta in metadata.items() if 'ref' in meta}
+            payload_start = f.tell()
+
+            # The fixed-size index is scanned in one go and every entry is handed to the pool
+            # at once; workers slice their data straight out of the mapping. The codecs
+            # release the GIL, so decompression and writing run in parallel.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                if layout == LAYOUT_FILE:
+                    (file_path, _), = metadata.items()
+                    entries = [(file_path, payload_start, len(mm) - payload_start)]
+                else:
+                    index_end = payload_start + _INDEX_ENTRY.size * (len(metadata) - len(references))
+                    entries = [
+                        (mm[name_offset:name_offset + name_len].decode('utf-8'), data_offset, data_len)
+                        for name_offset, name_len, data_offset, data_len
+                        in _INDEX_ENTRY.iter_unpack(mm[payload_start:index_end])
+                    ]
+
+                futures = []
+                for file_path, data_offset, data_len in entries:
+                    output_file_path = os.path.join(output_path, file_path)
+                    futures.append(executor.submit(self._extract_entry, metadata[file_path], mm,
+                                                   data_offset, data_len, output_file_path))
+
+                for future in as_completed(futures):
+                    future.result()
+
+        # Duplicates have no record of their own; copy them from the extracted original
+        for file_path, original_path in references.items():
+            output_file_path = os.path.join(output_path, file_path)
+            os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
+            shutil.copyfile(os.path.join(output_path, original_path), output_file_path)
+
+    def _extract_entry(self, meta: Dict, mm: mmap.mmap, offset: int, length: int, output_file_path: str) -> None:
+        os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
+        # The view must be released before the mapping can be closed
+        with memoryview(mm)[offset:offset + length] as compressed_data:
+            if meta.get('passthrough'):
+                decompressed_data = compressed_data
+            else:
                 algorithm = meta['algorithm']
                 decompressed_data = self.decompression_methods[algorithm](compressed_data)
-                
-                output_file_path = os.path.join(output_path, file_path)
-                os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
-                with open(output_file_path, 'wb') as output_file:
-                    output_file.write(decompressed_data)
+
+            with open(output_file_path, 'wb') as output_file:
+                output_file.write(decompressed_data)
+
+    def _write_header(self, f, layout: int, metadata: Dict) -> None:
+        # Metadata maps each stored file name to its compression metadata, for both layouts
+        metadata_blob = msgpack.packb(metadata)
+        f.write(DHC_MAGIC + bytes([FORMAT_VERSION, layout]) + _LENGTH.pack(len(metadata_blob)) + metadata_blob)
+
+    def _read_header(self, f) -> Tuple[int, Dict]:
+        signature = f.read(5)
+        if signature[:3] != DHC_MAGIC or signature[3:4] != bytes([FORMAT_VERSION]):
+            raise ValueError("Unsupported .dhc file. It was written by an incompatible version.")
+        if signature[4:] not in (bytes([LAYOUT_FILE]), bytes([LAYOUT_FOLDER])):
+            raise ValueError("Invalid .dhc file. Unknown archive layout.")
+        metadata_len = _LENGTH.unpack(f.read(_LENGTH.size))[0]
+        return signature[4], msgpack.unpackb(f.read(metadata_len), raw=False)
+
+    def _compress_stream(self, algorithm: str, compression_method: Callable[[bytes], Tuple[bytes, Dict]],
+                         data: bytes) -> Tuple[Iterable[bytes], Dict]:
+        if algorithm in self.stream_compressors:
+            # Compressed lazily, so chunks can go straight to the output file. compression_method
+            # only wraps the same factory, so it is not called here.
+            return self._compress_chunks(algorithm, data), {'algorithm': algorithm}
+        compressed_data, metadata = compression_method(data)
+        return (compressed_data,), metadata
+
+    def _compress_chunks(self, algorithm: str, data: bytes) -> Iterator[bytes]:
+        compressor = self.stream_compressors[algorithm](len(data))
+        for i in range(0, len(data), CHUNK_SIZE):
+            yield compressor.compress(data[i:i + CHUNK_SIZE])
+        yield compressor.flush()
+
+    def _is_passthrough(self, algorithm: str, header: bytes) -> bool:
+        # Whether the algorithm stores this input unchanged; only the first SIGNATURE_SIZE bytes are inspected
+        match = self._passthrough_re.match(header)
+        return match is not None and match.lastgroup == algorithm
 
     def _analyze_data(self, data: bytes) -> str:
-        # Basic data analysis based on file signature or content
-        if data.startswith(b'\xFF\xD8'):
-            return 'image'
-        elif data.startswith(b'ID3') or data.startswith(b'\xFF\xFB'):
-            return 'audio'
-        else:
-            return 'text'
+        # Basic data analysis based on file signature
+        match = self._magic_re.match(data)
+        return match.lastgroup if match else 'text'
 
-    def _select_best_algorithm(self, data_type: str) -> str:
-        # Simplified selection of the best algorithm
-        return self.algorithms[data_type][0]  # Just select the first algorithm for now
+    def _select_compressor(self, header: bytes) -> Tuple[str, Callable[[bytes], Tuple[bytes, Dict]]]:
+        # Already-encoded images and audio go to the algorithm for their own format, which stores them verbatim
+        match = self._passthrough_re.match(header)
+        if match is not None and match.lastgroup in self.algorithms['image'] + self.algorithms['audio']:
+            return match.lastgroup, self.compression_methods[match.lastgroup]
+        # Simplified selection of the best algorithm: the first one listed for the data type.
+        # self.algorithms is read on every call, so changes to it take effect immediately.
+        best_algorithm = self.algorithms[self._analyze_data(header)][0]
+        return best_algorithm, self.compression_methods[best_algorithm]
+
+    # Compression and decompression methods. The text ones join the output of stream_compressors.
+    def _compress_zstd(self, data: bytes) -> Tuple[bytes, Dict]:
+        compressed_data = b''.join(self._compress_chunks('zstd', data))
+        metadata = {'algorithm': 'zstd'}
+        return compressed_data, metadata
 
-    # Compression and decompression methods
     def _compress_lz77(self, data: bytes) -> Tuple[bytes, Dict]:
-        compressed_data = zlib.compress(data)
+        compressed_data = b''.join(self._compress_chunks('lz77', data))
         metadata = {'algorithm': 'lz77'}
         return compressed_data, metadata
 
     def _compress_lz78(self, data: bytes) -> Tuple[bytes, Dict]:
-        compressed_data = bz2.compress(data)
+        compressed_data = b''.join(self._compress_chunks('lz78', data))
         metadata = {'algorithm': 'lz78'}
         return compressed_data, metadata
 
     def _compress_lzma(self, data: bytes) -> Tuple[bytes, Dict]:
-        compressed_data = lzma.compress(data)
+        compressed_data = b''.join(self._compress_chunks('lzma', data))
         metadata = {'algorithm': 'lzma'}
         return compressed_data, metadata
 
     def _compress_jpeg(self, data: bytes) -> Tuple[bytes, Dict]:
+        if self._is_passthrough('jpeg', data[:SIGNATURE_SIZE]):  # Already in the target format, keep the original bytes
+            return bytes(data), {'algorithm': 'jpeg', 'passthrough': True}
         with BytesIO(data) as input_buffer:
             with Image.open(input_buffer) as img:
                 output_buffer = BytesIO()
@@ -153,6 +351,8 @@ class DHC:
         return compressed_data, metadata
 
     def _compress_png(self, data: bytes) -> Tuple[bytes, Dict]:
+        if self._is_passthrough('png', data[:SIGNATURE_SIZE]):
+            return bytes(data), {'algorithm': 'png', 'passthrough': True}
         with BytesIO(data) as input_buffer:
             with Image.open(input_buffer) as img:
                 output_buffer = BytesIO()
@@ -162,6 +362,8 @@ class DHC:
         return compressed_data, metadata
 
     def _compress_webp(self, data: bytes) -> Tuple[bytes, Dict]:
+        if self._is_passthrough('webp', data[:SIGNATURE_SIZE]):
+            return bytes(data), {'algorithm': 'webp', 'passthrough': True}
         with BytesIO(data) as input_buffer:
             with Image.open(input_buffer) as img:
                 output_buffer = BytesIO()
@@ -171,6 +373,9 @@ class DHC:
         return compressed_data, metadata
 
     def _compress_mp3(self, data: bytes) -> Tuple[bytes, Dict]:
+        if self._is_passthrough('mp3', data[:SIGNATURE_SIZE]):
+            # Already encoded, so skip the ffmpeg decode/re-encode round trip
+            return bytes(data), {'algorithm': 'mp3', 'passthrough': True}
         with BytesIO(data) as input_buffer:
             audio = AudioSegment.from_file(input_buffer)
             output_buffer = BytesIO()
@@ -180,6 +385,8 @@ class DHC:
         return compressed_data, metadata
 
     def _compress_flac(self, data: bytes) -> Tuple[bytes, Dict]:
+        if self._is_passthrough('flac', data[:SIGNATURE_SIZE]):
+            return bytes(data), {'algorithm': 'flac', 'passthrough': True}
         with BytesIO(data) as input_buffer:
             audio = AudioSegment.from_file(input_buffer)
             output_buffer = BytesIO()
@@ -189,6 +396,8 @@ class DHC:
         return compressed_data, metadata
 
     def _compress_aac(self, data: bytes) -> Tuple[bytes, Dict]:
+        if self._is_passthrough('aac', data[:SIGNATURE_SIZE]):
+            return bytes(data), {'algorithm': 'aac', 'passthrough': True}
         with BytesIO(data) as input_buffer:
             audio = AudioSegment.from_file(input_buffer)
             output_buffer = BytesIO()
@@ -197,6 +406,9 @@ class DHC:
         metadata = {'algorithm': 'aac'}
         return compressed_data, metadata
 
+    def _decompress_zstd(self, compressed_data: bytes) -> bytes:
+        return zstd.ZstdDecompressor().decompress(compressed_data)
+
     def _decompress_lz77(self, compressed_data: bytes) -> bytes:
         return zlib.decompress(compressed_data)
 
@@ -239,6 +451,75 @@ class DHC:
             decompressed_data = output_buffer.getvalue()
         return decompressed_data
 
+def _scan_files(folder_path: str) -> Iterator[os.DirEntry]:
+    # os.scandir reuses the file type from the directory listing, so unlike os.walk
+    # this needs no extra stat call per entry
+    with os.scandir(folder_path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_files(entry.path)
+            elif not entry.is_dir():  # Symlinked folders are listed but not followed, as with os.walk
+                yield entry
+
+def _read_signature(file_path: str) -> bytes:
+    # Unbuffered, so classifying a file costs a single small read
+    with open(file_path, 'rb', buffering=0) as f:
+        return f.read(SIGNATURE_SIZE)
+
+@contextmanager
+def _map_file(file_path: str) -> Iterator[Union[bytes, mmap.mmap]]:
+    # Map the file read-only so the kernel pages it in as it is consumed
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''  # Empty files cannot be mapped
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+def _hash_file(file_path: str) -> bytes:
+    # hashlib uses the CPU's SHA extensions where available, far faster than any compressor
+    with _map_file(file_path) as data:
+        return hashlib.sha256(data).digest()
+
+def _copy_into(src_path: str, dst) -> int:
+    # Returns the number of bytes copied
+    with open(src_path, 'rb') as src:
+        if not _USE_SENDFILE:
+            shutil.copyfileobj(src, dst, IO_BUFFER_SIZE)
+            return src.tell()
+        dst.flush()
+        size = os.fstat(src.fileno()).st_size
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+            if sent == 0:  # The source was truncated after it was measured
+                break
+            offset += sent
+        return offset
+
+# Per-process DHC instance used by the folder compression workers
+_worker_dhc = None
+
+def _init_worker(dhc_class: type, algorithms: Dict[str, List[str]], lzma_preset: int) -> None:
+    global _worker_dhc
+    # There is already one worker per core, so zstd must not start threads of its own
+    _worker_dhc = dhc_class(lzma_preset=lzma_preset, zstd_threads=0)
+    _worker_dhc.algorithms = algorithms
+
+def _compress_one(file_path: str, relative_path: str, temp_dir: str) -> Tuple[str, str, Dict]:
+    header = _read_signature(file_path)
+    algorithm, compression_method = _worker_dhc._select_compressor(header)
+    if _worker_dhc._is_passthrough(algorithm, header):
+        # Stored verbatim, so the original file is spliced into the archive as is
+        return relative_path, file_path, {'algorithm': algorithm, 'passthrough': True}
+
+    fd, data_path = tempfile.mkstemp(dir=temp_dir)
+    with os.fdopen(fd, 'wb') as f, _map_file(file_path) as data:
+        chunks, metadata = _worker_dhc._compress_stream(algorithm, compression_method, data)
+        for chunk in chunks:
+            f.write(chunk)
+    return relative_path, data_path, metadata
+
 # Usage example
 if __name__ == "__main__":
     dhc = DHC()